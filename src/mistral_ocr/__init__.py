@@ -1,28 +1,57 @@
 """CLI interface for Mistral OCR PDF to Markdown converter."""
 
+import os
+import queue
+import threading
+from collections.abc import Iterable, Iterator, Sized
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
-from typing import Annotated, Literal
-
-from mistralai import Mistral
-from pydantic import BaseModel
+from typing import TYPE_CHECKING, Annotated, Literal, TypeVar
 
 import typer
 from rich.console import Console
-from tqdm import tqdm
 
 from .ocr_utils import (
     initialize_mistral_client,
     process_and_save_pdf,
+    claim_output_path,
     handle_clipboard_operation,
+    markdown_output_path,
+    MarkdownWriter,
     ProcessedDocument,
+    RateLimiter,
 )
+from .batch_utils import process_pdfs_in_batch
 from .cache_utils import Cache
 
+if TYPE_CHECKING:
+    from mistralai import Mistral
+
+T = TypeVar("T")
+
 app = typer.Typer(help="Convert PDF files to Markdown using Mistral OCR")
 console = Console()
 
+# OCR calls are dominated by network latency, so a handful of threads sharing
+# one client gives a near-linear speedup without flooding the API.
+DEFAULT_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+DEFAULT_MAX_IN_FLIGHT = 8
+# Below this many top-level subdirectories, a threaded scan isn't worth it.
+PARALLEL_SCAN_MIN_SUBDIRS = 4
+PARALLEL_SCAN_WORKERS = 16
+
 
-class FileAction(BaseModel):
+@dataclass(slots=True, frozen=True)
+class FileAction:
     """Represents a planned action for a single PDF file.
 
     Attributes:
@@ -58,7 +87,8 @@ class FileAction(BaseModel):
         return self.action == "skip"
 
 
-class ConversionPlan(BaseModel):
+@dataclass(slots=True)
+class ConversionPlan:
     """Plan describing how files should be processed."""
 
     files: list[FileAction]
@@ -67,18 +97,20 @@ class ConversionPlan(BaseModel):
     force: bool = False
 
 
-class ValidationError(BaseModel):
+@dataclass(slots=True)
+class ValidationError:
     """Represents a validation error."""
 
     message: str
     error_code: int = 1
 
 
-class ValidationResult(BaseModel):
+@dataclass(slots=True)
+class ValidationResult:
     """Result of validation operations."""
 
     is_valid: bool
-    errors: list[ValidationError] = []
+    errors: list[ValidationError] = field(default_factory=list)
 
     @property
     def error_messages(self) -> list[str]:
@@ -163,99 +195,376 @@ def is_pdf_file(file_path: Path) -> bool:
 
     Returns:
         True if the file has a .pdf extension
+
+    Note:
+        Directory scans match names directly (see `_scan_files`) and do not
+        go through this helper.
     """
     return file_path.suffix.lower() == ".pdf"
 
 
-def find_pdf_files_pure(input_path: Path) -> tuple[list[Path], list[str]]:
+def _scan_dir(path: str, suffix: str, subdirs: list[str]) -> list[Path]:
+    """List the files of one directory ending with lowercase `suffix`.
+
+    Subdirectories are appended to `subdirs`. Unreadable directories are
+    treated as empty.
+    """
+    # Only the tail of each name is lowercased, not the whole name.
+    tail = -len(suffix)
+    found: list[Path] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name[tail:].lower() == suffix and entry.is_file():
+                    found.append(Path(entry.path))
+    except OSError:
+        pass
+    return found
+
+
+def _walk_dirs(pending: list[str], suffix: str) -> Iterator[Path]:
+    while pending:
+        yield from _scan_dir(pending.pop(), suffix, pending)
+
+
+def _scan_files(root: Path, suffix: str) -> Iterator[Path]:
+    """Yield files under `root` whose name ends with `suffix`, recursively.
+
+    Uses `os.scandir` so the file type comes from the cached directory entry
+    and a `Path` is only built for matching files, which is much cheaper than
+    `Path.glob("**/*.pdf")` on large trees. The suffix match is
+    case-insensitive. Symlinked directories are not followed (avoiding
+    cycles) and unreadable directories are skipped, like `glob` does.
+
+    When `root` has many subdirectories, each one is walked on its own
+    thread: on network file systems every `scandir` is a round trip, and
+    the GIL is released while waiting on it.
+    """
+    suffix = suffix.lower()
+    subdirs: list[str] = []
+    yield from _scan_dir(os.fspath(root), suffix, subdirs)
+
+    if len(subdirs) < PARALLEL_SCAN_MIN_SUBDIRS:
+        yield from _walk_dirs(subdirs, suffix)
+        return
+
+    with ThreadPoolExecutor(
+        max_workers=min(PARALLEL_SCAN_WORKERS, len(subdirs)),
+        thread_name_prefix="mistral-ocr-scan",
+    ) as executor:
+        # map() keeps the subtrees in a stable order.
+        for files in executor.map(
+            lambda subdir: list(_walk_dirs([subdir], suffix)), subdirs
+        ):
+            yield from files
+
+
+def _scan_pdfs(root: Path) -> Iterator[Path]:
+    return _scan_files(root, ".pdf")
+
+
+def _prefetch(items: Iterable[T], maxsize: int = 256) -> Iterator[T]:
+    """Iterate over `items` from a background thread, up to `maxsize` ahead.
+
+    Lets a slow producer (e.g. a directory walk on a network mount) keep
+    running while the consumer is busy, instead of only advancing when the
+    next item is requested. Exceptions raised by `items` are re-raised in
+    the consumer.
+    """
+    # Items travel wrapped in a 1-tuple; None marks the end of the iteration.
+    buffer: queue.Queue[tuple[T] | BaseException | None] = queue.Queue(maxsize)
+
+    def produce() -> None:
+        try:
+            for item in items:
+                buffer.put((item,))
+        except BaseException as e:
+            buffer.put(e)
+        else:
+            buffer.put(None)
+
+    # Daemon: an abandoned iteration must not keep the process alive.
+    threading.Thread(target=produce, name="mistral-ocr-prefetch", daemon=True).start()
+    while (entry := buffer.get()) is not None:
+        if isinstance(entry, BaseException):
+            raise entry
+        yield entry[0]
+
+
+def find_existing_outputs(output_dir: Path) -> set[Path]:
+    """Collect the markdown files already present under `output_dir`.
+
+    One directory walk answers every "does this output exist?" question of a
+    plan, instead of one `stat()` per PDF.
+    """
+    if not output_dir.is_dir():
+        return set()
+    return set(_scan_files(output_dir, ".md"))
+
+
+def find_pdf_files_pure(
+    input_path: Path, input_is_dir: bool
+) -> tuple[Iterator[Path], list[str]]:
     """Find all PDF files in the given path, returning both files and warnings.
 
+    Directories are walked lazily: the returned iterator yields PDFs as the
+    tree is traversed.
+
     Args:
-        input_path: Path to search for PDF files
+        input_path: Existing path to search for PDF files
+        input_is_dir: Whether `input_path` is a directory
 
     Returns:
         Tuple of (pdf_files, warnings)
     """
     warnings: list[str] = []
 
-    if input_path.is_file():
-        if is_pdf_file(input_path):
-            return [input_path], warnings
-        else:
-            warnings.append(f"Warning: {input_path} is not a PDF file")
-            return [], warnings
+    if input_is_dir:
+        return _scan_pdfs(input_path), warnings
 
-    if input_path.is_dir():
-        pdf_files = list(input_path.glob("**/*.pdf"))
-        return pdf_files, warnings
+    if is_pdf_file(input_path):
+        return iter([input_path]), warnings
 
-    return [], warnings
+    warnings.append(f"Warning: {input_path} is not a PDF file")
+    return iter([]), warnings
 
 
-def find_pdf_files(input_path: Path) -> list[Path]:
+def find_pdf_files(
+    input_path: Path, input_is_dir: bool | None = None
+) -> Iterator[Path]:
     """Find all PDF files in the given path.
 
     Args:
-        input_path: Path to search for PDF files
+        input_path: Existing path to search for PDF files
+        input_is_dir: Whether `input_path` is a directory. If None, the
+            filesystem is checked.
 
-    Returns:
-        List of PDF file paths
+    Yields:
+        PDF file paths, as they are discovered
     """
-    pdf_files, warnings = find_pdf_files_pure(input_path)
+    if input_is_dir is None:
+        input_is_dir = input_path.is_dir()
+    pdf_files, warnings = find_pdf_files_pure(input_path, input_is_dir)
 
     # Handle side effects
     for warning in warnings:
         console.print(f"[yellow]{warning}[/yellow]")
 
-    return pdf_files
+    yield from pdf_files
+
+
+def _report_result(
+    pdf_file: Path, result: tuple[bool, str, ProcessedDocument | None]
+) -> None:
+    success, message, doc = result
+    if success and doc and doc.from_cache:
+        console.print(f"✓ {pdf_file.name} (cached)")
+    elif success:
+        console.print(f"⟳ {pdf_file.name} (processing...)")
+    else:
+        console.print(f"✗ {pdf_file.name}: {message}")
 
 
 def process_pdf_files(
-    client: Mistral,
-    pdf_files: list[Path],
+    client: "Mistral",
+    pdf_files: Iterable[Path],
     output_dir: Path,
     force: bool,
     cache: Cache | None,
     show_progress: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate_limiter: RateLimiter | None = None,
 ) -> list[tuple[bool, str, ProcessedDocument | None]]:
-    """Process multiple PDF files.
+    """Process multiple PDF files concurrently.
+
+    Files are processed by a bounded thread pool sharing the same client.
+    `pdf_files` may be a lazy iterator (e.g. from `find_pdf_files`): it is
+    consumed only as workers free up, so the first OCR request starts before
+    the directory walk completes. Results are returned in the same order as
+    `pdf_files`, regardless of completion order.
 
     Args:
         client: Initialized Mistral client
-        pdf_files: List of PDF files to process
+        pdf_files: PDF files to process
         output_dir: Output directory for markdown files
         force: Whether to overwrite existing files
         show_progress: Whether to show progress bar
+        concurrency: Maximum number of files processed at the same time
+        rate_limiter: Optional limiter throttling the API requests
+
+    Returns:
+        List of processing results
+    """
+    assert concurrency >= 1, "concurrency must be at least 1"
+
+    # Imported here: only real runs draw a progress bar.
+    from rich.progress import (
+        BarColumn,
+        MofNCompleteColumn,
+        Progress,
+        SpinnerColumn,
+        TextColumn,
+    )
+
+    # Created once here; the per-file writes assume it exists.
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    total = len(pdf_files) if isinstance(pdf_files, Sized) else None
+    # No point in spawning more threads than there are known files.
+    workers = min(concurrency, total) if total else concurrency
+    # Bound the number of submitted-but-unfinished files so a huge directory
+    # is never fully materialized ahead of the workers.
+    max_pending = 2 * workers
+    seen_files: list[Path] = []
+    claimed_outputs: set[Path] = set()
+    results: list[tuple[bool, str, ProcessedDocument | None] | None] = []
+    index_by_future: dict[Future[tuple[bool, str, ProcessedDocument | None]], int] = {}
+
+    with (
+        MarkdownWriter() as writer,
+        ThreadPoolExecutor(max_workers=workers) as executor,
+        Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=console,
+            transient=True,
+            disable=not show_progress or (total is not None and total <= 1),
+        ) as progress,
+    ):
+        task = progress.add_task("Processing PDFs", total=total)
+
+        def record(
+            index: int, result: tuple[bool, str, ProcessedDocument | None]
+        ) -> None:
+            results[index] = result
+            pdf_file = seen_files[index]
+            _report_result(pdf_file, result)
+            # Rich redraws on its own refresh timer, not on every update.
+            progress.update(task, advance=1, description=f"Processed {pdf_file.name}")
+
+        pending: set[Future[tuple[bool, str, ProcessedDocument | None]]] = set()
+        for index, pdf_file in enumerate(pdf_files):
+            seen_files.append(pdf_file)
+            results.append(None)
+
+            # Existing outputs are skipped here, without a round trip through
+            # the thread pool. Claiming the path at submission also skips a
+            # second PDF with the same name, whose write would race the first.
+            output_path = markdown_output_path(pdf_file, output_dir)
+            if skipped := claim_output_path(output_path, force, claimed_outputs):
+                record(index, skipped)
+                continue
+
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record(index_by_future[future], future.result())
+
+            future = executor.submit(
+                process_and_save_pdf,
+                client,
+                pdf_file,
+                output_dir,
+                force,
+                cache,
+                rate_limiter,
+                writer,
+            )
+            index_by_future[future] = index
+            pending.add(future)
+
+        for future in as_completed(pending):
+            record(index_by_future[future], future.result())
+
+    if not results:
+        console.print("[yellow]No PDF files found to process[/yellow]")
+
+    return [_with_write_error(result, writer.errors) for result in results if result]
+
+
+def process_pdf_files_in_batch(
+    client: "Mistral",
+    pdf_files: Iterable[Path],
+    output_dir: Path,
+    force: bool,
+    cache: Cache | None,
+    rate_limiter: RateLimiter | None = None,
+    max_wait: float | None = None,
+) -> list[tuple[bool, str, ProcessedDocument | None]]:
+    """Process multiple PDF files as a single Mistral batch job.
+
+    Trades latency for throughput: the OCR requests are not subject to the
+    per-request rate limits, but the job may take a while to be scheduled.
+    If waiting for the job fails or is interrupted, its id is printed: the
+    job keeps running on Mistral's side and its results can still be fetched.
+
+    Args:
+        client: Initialized Mistral client
+        pdf_files: PDF files to process
+        output_dir: Output directory for markdown files
+        force: Whether to overwrite existing files
+        cache: Optional cache of OCR results
+        rate_limiter: Optional limiter throttling the API requests
+        max_wait: Seconds after which to stop waiting for the job, or None
 
     Returns:
         List of processing results
     """
+    # The whole batch is submitted at once, so the files are needed up front.
+    pdf_files = list(pdf_files)
     if not pdf_files:
         console.print("[yellow]No PDF files found to process[/yellow]")
         return []
 
-    results: list[tuple[bool, str, ProcessedDocument | None]] = []
-    iterator = pdf_files
+    submitted_job_ids: list[str] = []
+
+    with console.status("Preparing OCR batch job...") as status:
+
+        def on_submitted(job_id: str, count: int) -> None:
+            submitted_job_ids.append(job_id)
+            console.print(f"Submitted batch job {job_id} ({count} PDFs)")
+            status.update(f"Waiting for batch job {job_id}...")
+
+        try:
+            results = process_pdfs_in_batch(
+                client,
+                pdf_files,
+                output_dir,
+                force,
+                cache,
+                rate_limiter,
+                on_submitted,
+                max_wait,
+            )
+        except BaseException:
+            for job_id in submitted_job_ids:
+                console.print(
+                    f"[yellow]Batch job {job_id} may still complete on Mistral: "
+                    "its results can be downloaded from the Mistral console "
+                    "or the batch API.[/yellow]"
+                )
+            raise
 
-    if show_progress and len(pdf_files) > 1:
-        iterator = tqdm(pdf_files, desc="Processing PDFs")
+    for pdf_file, result in zip(pdf_files, results, strict=True):
+        _report_result(pdf_file, result)
 
-    for pdf_file in iterator:
-        if show_progress and len(pdf_files) > 1:
-            if isinstance(iterator, tqdm):
-                iterator.set_description(f"Processing {pdf_file.name}")  # type: ignore
+    return results
 
-        result = process_and_save_pdf(client, pdf_file, output_dir, force, cache)
-        results.append(result)
-        success, message, doc = result
-        if success and doc and doc.from_cache:
-            console.print(f"✓ {pdf_file.name} (cached)")
-        elif success:
-            console.print(f"⟳ {pdf_file.name} (processing...)")
-        else:
-            console.print(f"✗ {pdf_file.name}: {message}")
 
-    return results
+def _with_write_error(
+    result: tuple[bool, str, ProcessedDocument | None], write_errors: dict[Path, str]
+) -> tuple[bool, str, ProcessedDocument | None]:
+    _, _, doc = result
+    if doc is None or doc.output_path not in write_errors:
+        return result
+
+    error = write_errors[doc.output_path]
+    console.print(f"✗ {doc.filename}: could not write {doc.output_path}")
+    return (False, f"Error writing {doc.output_path}: {error}", None)
 
 
 def print_processing_summary(
@@ -266,11 +575,18 @@ def print_processing_summary(
     Args:
         results: List of processing results
     """
-    success_count = sum(1 for success, _, _ in results if success)
-    cache_count = sum(
-        1 for success, _, doc in results if success and doc and doc.from_cache
-    )
-    fail_count = len(results) - success_count
+    # Single pass: results can be numerous and hold full markdown documents.
+    success_count = 0
+    cache_count = 0
+    failure_messages: list[str] = []
+    for success, message, doc in results:
+        if not success:
+            failure_messages.append(message)
+            continue
+        success_count += 1
+        if doc and doc.from_cache:
+            cache_count += 1
+    fail_count = len(failure_messages)
 
     console.print("\n[bold green]Processing Complete[/bold green]")
     if success_count:
@@ -283,46 +599,53 @@ def print_processing_summary(
         console.print(f"  Failed / Skipped: [yellow]{fail_count}[/yellow]")
         console.print("\n[bold yellow]Details:[/bold yellow]")
 
-        for success, message, _ in results:
-            if not success:
-                if "Skipping" in message or "already exists" in message:
-                    console.print(f"[yellow]• {message}[/yellow]")
-                else:
-                    console.print(f"[red]• {message}[/red]")
+        # One print for all details rather than one terminal write per file.
+        console.print(
+            "\n".join(
+                f"[yellow]• {message}[/yellow]"
+                if "Skipping" in message or "already exists" in message
+                else f"[red]• {message}[/red]"
+                for message in failure_messages
+            )
+        )
 
 
 def determine_output_directory(
-    input_path: Path, output_dir: Path | None = None
+    input_path: Path, output_dir: Path | None, input_is_dir: bool
 ) -> Path:
     """Determine the output directory for processed files.
 
     Args:
         input_path: Input path (file or directory)
         output_dir: Explicitly specified output directory
+        input_is_dir: Whether `input_path` is a directory
 
     Returns:
         Resolved output directory path
     """
     if output_dir is not None:
         return output_dir
-    elif input_path.is_dir():
+    elif input_is_dir:
         return input_path
     else:  # input_path is a file
         return input_path.parent
 
 
-def calculate_output_path(pdf_file: Path, input_path: Path, output_dir: Path) -> Path:
+def calculate_output_path(
+    pdf_file: Path, input_path: Path, output_dir: Path, input_is_dir: bool
+) -> Path:
     """Calculate the output path for a PDF file.
 
     Args:
         pdf_file: The PDF file to process
         input_path: The original input path (file or directory)
         output_dir: The resolved output directory
+        input_is_dir: Whether `input_path` is a directory
 
     Returns:
         The calculated output path for the markdown file
     """
-    if input_path.is_dir():
+    if input_is_dir:
         # Preserve directory structure: compute path relative to input directory
         rel_pdf = pdf_file.relative_to(input_path)
         rel_md = rel_pdf.with_suffix(".md")
@@ -332,18 +655,31 @@ def calculate_output_path(pdf_file: Path, input_path: Path, output_dir: Path) ->
         return output_dir / f"{pdf_file.stem}.md"
 
 
-def create_file_action(pdf_file: Path, output_path: Path, force: bool) -> FileAction:
+def create_file_action(
+    pdf_file: Path,
+    output_path: Path,
+    force: bool,
+    existing_outputs: set[Path] | None = None,
+) -> FileAction:
     """Create a file action based on whether the output file exists.
 
     Args:
         pdf_file: The PDF file to process
         output_path: The calculated output path
         force: Whether to overwrite existing files
+        existing_outputs: Output files known to exist (see
+            `find_existing_outputs`). If None, the filesystem is checked.
 
     Returns:
         A FileAction describing what should be done
     """
-    if output_path.exists():
+    output_exists = (
+        output_path.exists()
+        if existing_outputs is None
+        else output_path in existing_outputs
+    )
+
+    if output_exists:
         if force:
             return FileAction(
                 input_path=pdf_file,
@@ -368,40 +704,102 @@ def create_file_action(pdf_file: Path, output_path: Path, force: bool) -> FileAc
         )
 
 
+def iter_file_actions(
+    pdf_files: Iterable[Path],
+    input_path: Path,
+    input_is_dir: bool,
+    output_dir: Path,
+    force: bool,
+    existing_outputs: set[Path] | None = None,
+) -> Iterator[FileAction]:
+    """Plan the action for each PDF file, one at a time (pure function).
+
+    Args:
+        pdf_files: PDF files to process, possibly a lazy iterator
+        input_path: Original input path
+        input_is_dir: Whether `input_path` is a directory
+        output_dir: Resolved output directory
+        force: Whether to overwrite existing files
+        existing_outputs: Output files known to exist (see
+            `find_existing_outputs`). If None, the filesystem is checked.
+
+    Yields:
+        A FileAction per PDF file, in the order of `pdf_files`
+    """
+    for pdf_file in pdf_files:
+        output_path = calculate_output_path(
+            pdf_file, input_path, output_dir, input_is_dir
+        )
+        yield create_file_action(pdf_file, output_path, force, existing_outputs)
+
+
 def create_conversion_plan_pure(
-    pdf_files: list[Path],
+    pdf_files: Iterable[Path],
     input_path: Path,
+    input_is_dir: bool,
     output_dir: Path,
     force: bool,
     clipboard: bool,
+    existing_outputs: set[Path] | None = None,
 ) -> ConversionPlan:
     """Create a conversion plan from a list of PDF files (pure function).
 
     Args:
-        pdf_files: List of PDF files to process
+        pdf_files: PDF files to process
         input_path: Original input path
+        input_is_dir: Whether `input_path` is a directory
         output_dir: Resolved output directory
         force: Whether to overwrite existing files
         clipboard: Whether to copy to clipboard
+        existing_outputs: Output files known to exist (see
+            `find_existing_outputs`). If None, the filesystem is checked.
 
     Returns:
         ConversionPlan describing what actions to take
     """
-    actions: list[FileAction] = []
-
-    for pdf_file in pdf_files:
-        output_path = calculate_output_path(pdf_file, input_path, output_dir)
-        action = create_file_action(pdf_file, output_path, force)
-        actions.append(action)
-
     return ConversionPlan(
-        files=actions,
+        files=list(
+            iter_file_actions(
+                pdf_files,
+                input_path,
+                input_is_dir,
+                output_dir,
+                force,
+                existing_outputs,
+            )
+        ),
         output_dir=output_dir,
         clipboard=clipboard,
         force=force,
     )
 
 
+def plan_file_actions(
+    pdf_files: Iterable[Path],
+    input_path: Path,
+    input_is_dir: bool,
+    output_dir: Path,
+    force: bool,
+) -> Iterator[FileAction]:
+    """Lazily plan the action for each of `pdf_files`, found under `input_path`.
+
+    For a directory, the existing outputs are collected up front and
+    `pdf_files` is consumed only as actions are. For a single file, only its
+    own output path is checked.
+    """
+    # For a single file, scanning the whole output directory (often a large
+    # parent folder) would cost far more than checking the one output path.
+    existing_outputs = find_existing_outputs(output_dir) if input_is_dir else None
+    return iter_file_actions(
+        pdf_files,
+        input_path,
+        input_is_dir,
+        output_dir,
+        force,
+        existing_outputs,
+    )
+
+
 def create_conversion_plan(
     input_path: Path,
     output_dir: Path | None,
@@ -410,15 +808,24 @@ def create_conversion_plan(
 ) -> ConversionPlan:
     """Create a plan describing what actions will be taken."""
 
-    resolved_output_dir = determine_output_directory(input_path, output_dir)
-    pdf_files = find_pdf_files(input_path)
+    input_is_dir = input_path.is_dir()
+    resolved_output_dir = determine_output_directory(
+        input_path, output_dir, input_is_dir
+    )
 
-    return create_conversion_plan_pure(
-        pdf_files=pdf_files,
-        input_path=input_path,
+    return ConversionPlan(
+        files=list(
+            plan_file_actions(
+                find_pdf_files(input_path, input_is_dir),
+                input_path,
+                input_is_dir,
+                resolved_output_dir,
+                force,
+            )
+        ),
         output_dir=resolved_output_dir,
-        force=force,
         clipboard=clipboard,
+        force=force,
     )
 
 
@@ -471,6 +878,49 @@ def convert(
         bool,
         typer.Option("--cache-stats", help="Show cache statistics and exit"),
     ] = False,
+    concurrency: Annotated[
+        int,
+        typer.Option(
+            "--concurrency",
+            "--workers",
+            "-j",
+            min=1,
+            help="Maximum number of PDFs processed in parallel",
+            envvar="MISTRAL_OCR_CONCURRENCY",
+        ),
+    ] = DEFAULT_CONCURRENCY,
+    rps: Annotated[
+        float,
+        typer.Option(
+            "--rps",
+            min=0.001,
+            help="Maximum number of API requests started per second",
+            envvar="MISTRAL_OCR_RPS",
+        ),
+    ] = DEFAULT_REQUESTS_PER_SECOND,
+    max_in_flight: Annotated[
+        int,
+        typer.Option(
+            "--max-in-flight",
+            min=1,
+            help="Maximum number of API requests awaiting a response at once",
+        ),
+    ] = DEFAULT_MAX_IN_FLIGHT,
+    batch: Annotated[
+        bool,
+        typer.Option(
+            "--batch",
+            help="Send all PDFs as one Mistral batch job instead of one request each",
+        ),
+    ] = False,
+    batch_max_wait: Annotated[
+        float | None,
+        typer.Option(
+            "--batch-max-wait",
+            min=0,
+            help="Stop waiting for a --batch job after this many seconds",
+        ),
+    ] = None,
 ) -> None:
     """Convert PDF files to Markdown using Mistral OCR."""
     # Validate input path
@@ -480,24 +930,21 @@ def convert(
             console.print(f"[red]Error: {error.message}[/red]")
             raise typer.Exit(code=error.error_code)
 
-    plan = create_conversion_plan(input_path, output_dir, force, clipboard)
-
-    # Validate output directory creation
-    output_validation = validate_output_directory_creation(plan.output_dir)
-    if not output_validation.is_valid:
-        for error in output_validation.errors:
-            console.print(f"[red]Error: {error.message}[/red]")
-            raise typer.Exit(code=error.error_code)
+    # Checked once here and threaded through the planning helpers.
+    input_is_dir = input_path.is_dir()
+    resolved_output_dir = determine_output_directory(
+        input_path, output_dir, input_is_dir
+    )
 
-    # Validate conversion plan
-    plan_validation = validate_conversion_plan(plan)
-    if not plan_validation.is_valid:
-        for error in plan_validation.errors:
-            if error.error_code == 0:  # Warning
-                console.print(f"[yellow]{error.message}[/yellow]")
-            else:
-                console.print(f"[red]Error: {error.message}[/red]")
-            raise typer.Exit(code=error.error_code)
+    # Files are found lazily so a real run can start OCR requests while the
+    # input tree is still being walked. Peek at the first one to report an
+    # empty input before doing any other work.
+    pdf_files = find_pdf_files(input_path, input_is_dir)
+    first_pdf = next(pdf_files, None)
+    if first_pdf is None:
+        console.print("[yellow]No PDF files found in the input path.[/yellow]")
+        raise typer.Exit(code=0)
+    pdf_files = chain([first_pdf], pdf_files)
 
     cache = Cache(enabled=not no_cache)
     if clear_cache:
@@ -508,18 +955,33 @@ def convert(
         stats = cache.stats()
         console.print("Cache statistics:")
         console.print(f"  Total entries: {stats.get('total_entries', 0)}")
-        console.print(f"  Total size: {stats.get('total_size', 0)} bytes")
+        console.print(f"  Stored size: {stats.get('total_size', 0)} bytes (compressed)")
         if stats:
             console.print(f"  Oldest: {stats.get('oldest', '')}")
             console.print(f"  Newest: {stats.get('newest', '')}")
         raise typer.Exit(code=0)
 
+    # Resolved once for display; each resolve() lstat()s every component.
+    absolute_input = input_path.resolve()
+    absolute_output_dir = resolved_output_dir.resolve()
+
     if dry_run:
+        # The dry run needs totals, so it materializes the whole plan.
+        plan = ConversionPlan(
+            files=list(
+                plan_file_actions(
+                    pdf_files, input_path, input_is_dir, resolved_output_dir, force
+                )
+            ),
+            output_dir=resolved_output_dir,
+            clipboard=clipboard,
+            force=force,
+        )
         console.print(
             "[bold blue]Dry run mode - no files will be converted.[/bold blue]"
         )
-        console.print(f"Input: {input_path.resolve()}")
-        console.print(f"Output Directory: {plan.output_dir.resolve()}")
+        console.print(f"Input: {absolute_input}")
+        console.print(f"Output Directory: {absolute_output_dir}")
         if plan.force:
             console.print(
                 "[yellow]Force mode enabled: Existing files will be overwritten.[/yellow]"
@@ -529,46 +991,65 @@ def convert(
                 "[blue]Clipboard mode enabled: Content will be copied to clipboard.[/blue]"
             )
 
-        to_convert = [
-            a for a in plan.files if a.action == "convert" and not a.will_overwrite
-        ]
-        to_overwrite = [
-            a for a in plan.files if a.action == "convert" and a.will_overwrite
-        ]
-        to_skip = [a for a in plan.files if a.action == "skip"]
+        to_convert: list[FileAction] = []
+        to_overwrite: list[FileAction] = []
+        to_skip: list[FileAction] = []
+        for action in plan.files:
+            if action.is_skipping:
+                to_skip.append(action)
+            elif action.will_overwrite:
+                to_overwrite.append(action)
+            else:
+                to_convert.append(action)
 
         total = len(plan.files)
         console.print(
             f"\n[bold]Summary:[/bold] {len(to_convert)} to convert, {len(to_overwrite)} to overwrite, {len(to_skip)} to skip (total: {total})\n"
         )
 
+        # Each section is rendered with a single print: one write per section
+        # instead of one per file on large trees.
         if to_convert:
             console.print("[bold green]Files to convert:[/bold green]")
-            for action in to_convert:
-                console.print(
+            console.print(
+                "\n".join(
                     f"  [green]{action.input_path}[/green] → [cyan]{action.output_path}[/cyan]"
+                    for action in to_convert
                 )
+            )
             console.print()
         if to_overwrite:
             console.print("[bold yellow]Files to overwrite:[/bold yellow]")
-            for action in to_overwrite:
-                console.print(
+            console.print(
+                "\n".join(
                     f"  [yellow]{action.input_path}[/yellow] → [cyan]{action.output_path}[/cyan] (will overwrite)"
+                    for action in to_overwrite
                 )
+            )
             console.print()
         if to_skip:
             console.print("[bold]Files to skip:[/bold]")
-            for action in to_skip:
-                console.print(
+            console.print(
+                "\n".join(
                     f"  [dim]{action.input_path}[/dim] → [dim]{action.output_path}[/dim] ([yellow]{action.skip_reason}[/yellow])"
+                    for action in to_skip
                 )
+            )
             console.print()
 
         console.print("[bold green]Dry run complete.[/bold green]")
         raise typer.Exit(code=0)
 
+    # Validate output directory creation. Done only now so that dry runs and
+    # the cache commands never create it.
+    output_validation = validate_output_directory_creation(resolved_output_dir)
+    if not output_validation.is_valid:
+        for error in output_validation.errors:
+            console.print(f"[red]Error: {error.message}[/red]")
+            raise typer.Exit(code=error.error_code)
+
     # Initialize Mistral client
-    client = initialize_mistral_client(api_key)
+    client = initialize_mistral_client(api_key, max_connections=concurrency)
     if not client:
         console.print(
             "[red]Error: Mistral API key is required. "
@@ -577,32 +1058,50 @@ def convert(
         raise typer.Exit(code=1)
 
     # Print configuration
-    console.print(f"Input: {input_path.resolve()}")
-    console.print(f"Output Directory: {plan.output_dir.resolve()}")
-    if plan.force:
+    console.print(f"Input: {absolute_input}")
+    console.print(f"Output Directory: {absolute_output_dir}")
+    if force:
         console.print(
             "[yellow]Force mode enabled: Existing files will be overwritten.[/yellow]"
         )
-    if plan.clipboard:
+    if clipboard:
         console.print(
             "[blue]Clipboard mode enabled: Content will be copied to clipboard.[/blue]"
         )
 
     try:
-        pdf_files_to_process = [a.input_path for a in plan.files if a.is_converting]
-        results = process_pdf_files(
-            client,
-            pdf_files_to_process,
-            plan.output_dir,
-            plan.force,
-            cache,
-        )
+        rate_limiter = RateLimiter(requests_per_second=rps, max_in_flight=max_in_flight)
+        # No FileActions here: both drivers check for existing outputs
+        # themselves, against the paths they actually write.
+        if batch:
+            results = process_pdf_files_in_batch(
+                client,
+                pdf_files,
+                resolved_output_dir,
+                force,
+                cache,
+                rate_limiter,
+                max_wait=batch_max_wait,
+            )
+        else:
+            results = process_pdf_files(
+                client,
+                # Keep walking the tree while the workers wait on the API. A
+                # single file is passed as a list: knowing the total lets
+                # process_pdf_files skip the progress bar and extra workers.
+                _prefetch(pdf_files) if input_is_dir else list(pdf_files),
+                resolved_output_dir,
+                force,
+                cache,
+                concurrency=concurrency,
+                rate_limiter=rate_limiter,
+            )
 
         # Print processing summary
         print_processing_summary(results)
 
         # Handle clipboard operation if requested
-        if plan.clipboard:
+        if clipboard:
             successful_documents = [
                 doc for success, _, doc in results if success and doc
             ]
@@ -616,6 +1115,8 @@ def convert(
     except Exception as e:
         console.print(f"\n[bold red]An unexpected error occurred:[/bold red] {str(e)}")
         raise typer.Exit(code=1)
+    finally:
+        cache.close()
 
 
 def main() -> None:
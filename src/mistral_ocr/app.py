@@ -3,17 +3,15 @@
 import os
 
 import streamlit as st
-from dotenv import load_dotenv
 from mistralai import Mistral, OCRResponse
 
 from mistral_ocr.ocr_utils import (
     initialize_mistral_client,
+    process_pdf_content,
     process_pdf_url,
     extract_markdown_from_response,
 )
 
-load_dotenv()
-
 
 def process_uploaded_pdf(
     client: Mistral,
@@ -25,7 +23,7 @@ def process_uploaded_pdf(
 
     Args:
         client: Initialized Mistral client
-        file_content: PDF file content as bytes
+        file_content: PDF content
         file_name: Name of the uploaded file
         include_image_base64: Whether to include base64 encoded images
 
@@ -33,26 +31,8 @@ def process_uploaded_pdf(
         OCR response or None if processing failed
     """
     try:
-        # Upload the file
-        uploaded_pdf = client.files.upload(
-            file={
-                "file_name": file_name,
-                "content": file_content,
-            },
-            purpose="ocr",
-        )
-
-        # Get signed URL
-        signed_url = client.files.get_signed_url(file_id=uploaded_pdf.id)
-
-        # Process OCR
-        return client.ocr.process(
-            model="mistral-ocr-latest",
-            document={
-                "type": "document_url",
-                "document_url": signed_url.url,
-            },
-            include_image_base64=include_image_base64,
+        return process_pdf_content(
+            client, file_content, file_name, include_image_base64
         )
     except Exception as e:
         st.error(f"Error processing uploaded file: {e}")
@@ -125,8 +105,11 @@ def handle_file_upload(client: Mistral) -> OCRResponse | None:
         "Convert Uploaded File", use_container_width=True, key="convert_upload"
     ):
         with st.spinner("Processing uploaded PDF..."):
-            file_content = uploaded_file.getvalue()
-            return process_uploaded_pdf(client, file_content, uploaded_file.name)
+            # UploadedFile is a BytesIO, which the SDK's File model rejects.
+            # getvalue() returns its whole buffer wherever the stream is.
+            return process_uploaded_pdf(
+                client, uploaded_file.getvalue(), uploaded_file.name
+            )
 
     return None
 
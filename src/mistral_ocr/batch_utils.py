@@ -0,0 +1,366 @@
+"""Run OCR for many PDFs as a single Mistral batch job."""
+
+import base64
+import json
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from contextlib import nullcontext
+from io import BufferedReader
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from .cache_utils import Cache, CacheEntry, cached_pdf_hash
+from .ocr_utils import (
+    OCR_MODEL,
+    ProcessedDocument,
+    RateLimiter,
+    cached_result,
+    claim_output_path,
+    make_cache_entry,
+    markdown_output_path,
+    retry_on_rate_limit,
+    store_result,
+)
+
+if TYPE_CHECKING:
+    from mistralai import Mistral
+    from mistralai.models import BatchJobOut
+
+OCR_ENDPOINT = "/v1/ocr"
+TERMINAL_STATUSES = frozenset({"SUCCESS", "FAILED", "TIMEOUT_EXCEEDED", "CANCELLED"})
+# Bound on the size of each uploaded request file, well under the API's
+# file size limit. Larger batches are split over several input files.
+MAX_BATCH_FILE_BYTES = 256 * 1024 * 1024
+# JSON envelope of a request, on top of the base64-encoded document.
+_REQUEST_OVERHEAD_BYTES = 256
+
+
+def estimated_request_size(pdf_file: Path) -> int:
+    """Size of the JSONL line `write_batch_requests` writes for `pdf_file`."""
+    return 4 * -(-pdf_file.stat().st_size // 3) + _REQUEST_OVERHEAD_BYTES
+
+
+def split_batch_requests(
+    pdf_files: list[Path], max_file_bytes: int = MAX_BATCH_FILE_BYTES
+) -> list[list[Path]]:
+    """Group `pdf_files`, in order, into request files of at most `max_file_bytes`.
+
+    A PDF whose request alone exceeds the bound gets a group of its own.
+    """
+    groups: list[list[Path]] = []
+    group_size = 0
+    for pdf_file in pdf_files:
+        size = estimated_request_size(pdf_file)
+        if not groups or group_size + size > max_file_bytes:
+            groups.append([])
+            group_size = 0
+        groups[-1].append(pdf_file)
+        group_size += size
+    return groups
+
+
+def write_batch_requests(
+    pdf_files: list[Path], out: IO[bytes], first_index: int = 0
+) -> None:
+    """Write one OCR request per PDF to `out`, as JSONL.
+
+    Documents are inlined as base64 data URLs, so the whole batch takes a
+    single upload instead of an upload and a signed URL per PDF. The
+    `custom_id` of each request is `first_index` plus the index of its PDF
+    in `pdf_files`.
+    """
+    for index, pdf_file in enumerate(pdf_files, start=first_index):
+        encoded = base64.b64encode(pdf_file.read_bytes()).decode("ascii")
+        request = {
+            "custom_id": str(index),
+            "body": {
+                "document": {
+                    "type": "document_url",
+                    "document_url": f"data:application/pdf;base64,{encoded}",
+                },
+                "include_image_base64": False,
+            },
+        }
+        out.write(json.dumps(request).encode("utf-8") + b"\n")
+
+
+@retry_on_rate_limit()
+def _upload_requests(
+    client: "Mistral",
+    requests_file: BufferedReader,
+    file_name: str,
+    rate_limiter: RateLimiter | None,
+) -> str:
+    requests_file.seek(0)
+    with rate_limiter or nullcontext():
+        uploaded = client.files.upload(
+            file={"file_name": file_name, "content": requests_file},
+            purpose="batch",
+        )
+    return uploaded.id
+
+
+@retry_on_rate_limit()
+def _create_job(
+    client: "Mistral", input_file_ids: list[str], rate_limiter: RateLimiter | None
+) -> str:
+    with rate_limiter or nullcontext():
+        job = client.batch.jobs.create(
+            input_files=input_file_ids, endpoint=OCR_ENDPOINT, model=OCR_MODEL
+        )
+    return job.id
+
+
+def _upload_request_group(
+    client: "Mistral",
+    pdf_files: list[Path],
+    first_index: int,
+    file_name: str,
+    rate_limiter: RateLimiter | None,
+) -> str:
+    # Spooled to disk: with inlined documents, a request file is as big as its
+    # PDFs combined. It is reopened read-only for the upload, because the SDK
+    # only accepts bytes or an io.BufferedReader, not the BufferedRandom of a
+    # temporary file.
+    requests_path: Path | None = None
+    try:
+        with tempfile.NamedTemporaryFile(suffix=".jsonl", delete=False) as out:
+            requests_path = Path(out.name)
+            write_batch_requests(pdf_files, out, first_index)
+        # Reopened only once closed, which Windows requires.
+        with open(requests_path, "rb") as requests_file:
+            return _upload_requests(client, requests_file, file_name, rate_limiter)
+    finally:
+        if requests_path is not None:
+            requests_path.unlink(missing_ok=True)
+
+
+def submit_ocr_batch(
+    client: "Mistral",
+    pdf_files: list[Path],
+    rate_limiter: RateLimiter | None = None,
+    max_file_bytes: int = MAX_BATCH_FILE_BYTES,
+) -> str:
+    """Upload the OCR requests for `pdf_files` and start a batch job.
+
+    The requests are split over as many input files as needed to keep each
+    one under `max_file_bytes` (see `split_batch_requests`); the job reads
+    them all, and `custom_id`s stay the indexes in `pdf_files`.
+
+    Args:
+        client: Initialized Mistral client
+        pdf_files: PDF files to process
+        rate_limiter: Optional limiter throttling the API requests
+        max_file_bytes: Bound on the size of each uploaded request file
+
+    Returns:
+        The batch job id
+    """
+    input_file_ids: list[str] = []
+    first_index = 0
+    for number, group in enumerate(split_batch_requests(pdf_files, max_file_bytes)):
+        input_file_ids.append(
+            _upload_request_group(
+                client, group, first_index, f"ocr_batch_{number}.jsonl", rate_limiter
+            )
+        )
+        first_index += len(group)
+    return _create_job(client, input_file_ids, rate_limiter)
+
+
+@retry_on_rate_limit()
+def _get_job(
+    client: "Mistral", job_id: str, rate_limiter: RateLimiter | None
+) -> "BatchJobOut":
+    with rate_limiter or nullcontext():
+        return client.batch.jobs.get(job_id=job_id)
+
+
+def wait_for_batch(
+    client: "Mistral",
+    job_id: str,
+    rate_limiter: RateLimiter | None = None,
+    max_wait: float | None = None,
+    poll_interval: float = 2.0,
+    max_poll_interval: float = 60.0,
+    sleep: Callable[[float], None] = time.sleep,
+    clock: Callable[[], float] = time.monotonic,
+) -> "BatchJobOut":
+    """Poll a batch job until it reaches a terminal status.
+
+    The polling interval doubles after each check, up to `max_poll_interval`:
+    batch jobs can take minutes to hours, and each poll is an API request.
+    Each poll is retried on transient errors, so a single 429 or 5xx during
+    a long wait doesn't abandon a job the server is still running.
+
+    Args:
+        client: Initialized Mistral client
+        job_id: Id of the batch job
+        rate_limiter: Optional limiter throttling the API requests
+        max_wait: Seconds after which to give up waiting, or None to wait
+            until the job finishes
+
+    Returns:
+        The finished job
+
+    Raises:
+        TimeoutError: If the job is still running after `max_wait` seconds
+    """
+    deadline = None if max_wait is None else clock() + max_wait
+    while True:
+        job = _get_job(client, job_id, rate_limiter)
+        if job.status in TERMINAL_STATUSES:
+            return job
+        if deadline is not None:
+            remaining = deadline - clock()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"batch job {job_id} still {job.status} after {max_wait:g}s"
+                )
+            poll_interval = min(poll_interval, remaining)
+        sleep(poll_interval)
+        poll_interval = min(max_poll_interval, poll_interval * 2)
+
+
+@retry_on_rate_limit()
+def _download_jsonl(
+    client: "Mistral", file_id: str, rate_limiter: RateLimiter | None
+) -> list[dict[str, Any]]:
+    with rate_limiter or nullcontext():
+        response = client.files.download(file_id=file_id)
+    try:
+        return [json.loads(line) for line in response.iter_lines() if line.strip()]
+    finally:
+        response.close()
+
+
+def read_batch_results(
+    client: "Mistral", job: "BatchJobOut", rate_limiter: RateLimiter | None = None
+) -> tuple[dict[str, str], dict[str, str]]:
+    """Download the results of a finished OCR batch job.
+
+    Both the output and the error file of the job are read; either may be
+    missing, e.g. when every request failed or none did.
+
+    Returns:
+        Tuple of (markdown by custom_id, error message by custom_id)
+    """
+    markdown: dict[str, str] = {}
+    errors: dict[str, str] = {}
+
+    records = [
+        record
+        for file_id in (job.output_file, job.error_file)
+        if file_id
+        for record in _download_jsonl(client, file_id, rate_limiter)
+    ]
+    for record in records:
+        custom_id = record["custom_id"]
+        response = record.get("response") or {}
+        body = response.get("body") or {}
+        if response.get("status_code") == 200 and "pages" in body:
+            markdown[custom_id] = "\n\n".join(
+                page["markdown"] for page in body["pages"]
+            )
+        else:
+            errors[custom_id] = str(record.get("error") or body or "unknown error")
+
+    return markdown, errors
+
+
+def process_pdfs_in_batch(
+    client: "Mistral",
+    pdf_files: Iterable[Path],
+    output_dir: Path,
+    force: bool,
+    cache: Cache | None,
+    rate_limiter: RateLimiter | None = None,
+    on_submitted: Callable[[str, int], None] | None = None,
+    max_wait: float | None = None,
+    max_file_bytes: int = MAX_BATCH_FILE_BYTES,
+) -> list[tuple[bool, str, ProcessedDocument | None]]:
+    """Process PDF files through one Mistral batch job and save their markdown.
+
+    Existing outputs and cached documents are resolved locally, like in
+    `process_and_save_pdf`; only the remaining files are sent in the batch.
+    A PDF mapping to the same output file as an earlier one is skipped
+    unless `force`, as in `process_pdf_files`.
+
+    Args:
+        client: Initialized Mistral client
+        pdf_files: PDF files to process
+        output_dir: Output directory for markdown files
+        force: Whether to overwrite existing files
+        cache: Optional cache of OCR results
+        rate_limiter: Optional limiter throttling the API requests
+        on_submitted: Called with the job id and its number of documents
+            once the batch job has been created
+        max_wait: Seconds after which to stop waiting for the job, see
+            `wait_for_batch`
+        max_file_bytes: Bound on the size of each uploaded request file. A PDF
+            too large to fit in one is reported as failed.
+
+    Returns:
+        List of processing results, in the same order as `pdf_files`
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    results: list[tuple[bool, str, ProcessedDocument | None] | None] = []
+    # (index in results, pdf file, output path, pdf hash) for each batched PDF.
+    pending: list[tuple[int, Path, Path, str]] = []
+    claimed_outputs: set[Path] = set()
+
+    for index, pdf_file in enumerate(pdf_files):
+        output_path = markdown_output_path(pdf_file, output_dir)
+        results.append(claim_output_path(output_path, force, claimed_outputs))
+        if results[index]:
+            continue
+        try:
+            pdf_hash = cached_pdf_hash(pdf_file, cache)
+            results[index] = cached_result(pdf_file, output_path, pdf_hash, cache)
+            if not results[index] and estimated_request_size(pdf_file) > max_file_bytes:
+                raise ValueError(
+                    f"too large for a batch request (over {max_file_bytes} bytes "
+                    "once encoded)"
+                )
+        except Exception as e:
+            results[index] = (False, f"Error processing {pdf_file}: {str(e)}", None)
+            continue
+        if not results[index]:
+            pending.append((index, pdf_file, output_path, pdf_hash))
+
+    if pending:
+        job_id = submit_ocr_batch(
+            client,
+            [pdf_file for _, pdf_file, _, _ in pending],
+            rate_limiter,
+            max_file_bytes,
+        )
+        if on_submitted:
+            on_submitted(job_id, len(pending))
+
+        job = wait_for_batch(client, job_id, rate_limiter, max_wait)
+        markdown, errors = read_batch_results(client, job, rate_limiter)
+        # Cached together in one transaction once all results are saved.
+        entries: list[CacheEntry] = []
+
+        for custom_id, (index, pdf_file, output_path, pdf_hash) in enumerate(pending):
+            key = str(custom_id)
+            if key not in markdown:
+                reason = errors.get(key, f"batch job ended with status {job.status}")
+                results[index] = (False, f"Error processing {pdf_file}: {reason}", None)
+                continue
+            try:
+                results[index] = store_result(
+                    pdf_file, output_path, pdf_hash, markdown[key], cache=None
+                )
+                if cache:
+                    entries.append(make_cache_entry(pdf_file, pdf_hash, markdown[key]))
+            except Exception as e:
+                results[index] = (False, f"Error processing {pdf_file}: {str(e)}", None)
+
+        if cache:
+            cache.set_many(entries)
+
+    return [result for result in results if result]
@@ -1,20 +1,46 @@
 """Utility functions for OCR processing and file operations."""
 
+import functools
+import importlib.util
 import os
+import random
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import UTC, datetime
-from pydantic import BaseModel
+from io import BufferedReader
+from types import TracebackType
+from typing import TYPE_CHECKING, ParamSpec, TypeVar
 
-from .cache_utils import Cache, CacheEntry, compute_pdf_hash
+from .cache_utils import Cache, CacheEntry, cached_pdf_hash
 
-import pyperclip  # type: ignore[import-untyped]
 from dotenv import load_dotenv
-from mistralai import Mistral, OCRResponse
 
+if TYPE_CHECKING:
+    # mistralai takes about half a second to import: load it only once a
+    # client is actually needed, so `--help` and dry runs stay fast.
+    from mistralai import Mistral, OCRResponse
+
+# The single place .env is loaded: the CLI and the Streamlit app both import
+# this module before reading MISTRAL_API_KEY.
 load_dotenv()
 
+P = ParamSpec("P")
+R = TypeVar("R")
+
+DEFAULT_MAX_CONNECTIONS = 16
+OCR_MODEL = "mistral-ocr-latest"
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_RETRYABLE_MESSAGE_MARKERS = ("rate limit", "quota", "429", "503")
+
 
-class ProcessedDocument(BaseModel):
+@dataclass(slots=True)
+class ProcessedDocument:
     """Represents a successfully processed document."""
 
     filename: str
@@ -23,33 +49,228 @@ class ProcessedDocument(BaseModel):
     from_cache: bool = False
 
 
-def initialize_mistral_client(api_key: str | None = None) -> Mistral | None:
+class RateLimiter:
+    """Throttle OCR requests to stay under the Mistral API rate limits.
+
+    Bursts of concurrent requests get rejected with HTTP 429. The limiter caps
+    the number of requests in flight and spaces request starts by at least
+    `1 / requests_per_second` seconds. A single instance is meant to be shared
+    by every thread issuing requests:
+
+        limiter = RateLimiter(requests_per_second=5, max_in_flight=8)
+        with limiter:
+            client.ocr.process(...)
+    """
+
+    def __init__(
+        self,
+        requests_per_second: float,
+        max_in_flight: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        assert requests_per_second > 0, "requests_per_second must be positive"
+        assert max_in_flight >= 1, "max_in_flight must be at least 1"
+        self._min_interval = 1.0 / requests_per_second
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._next_start = float("-inf")
+        self._clock = clock
+        self._sleep = sleep
+
+    def wait_for_slot(self) -> None:
+        """Block until the next request is allowed to start."""
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_start)
+            self._next_start = start + self._min_interval
+        # Sleep outside the lock: the slot is already reserved.
+        if start > now:
+            self._sleep(start - now)
+
+    def __enter__(self) -> "RateLimiter":
+        self._in_flight.acquire()
+        try:
+            self.wait_for_slot()
+        except BaseException:
+            self._in_flight.release()
+            raise
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._in_flight.release()
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Tell whether an API error is transient (rate limit, overload, 5xx)."""
+    status_code = getattr(error, "status_code", None)
+    if status_code in RETRYABLE_STATUS_CODES:
+        return True
+
+    message = str(error).lower()
+    return any(marker in message for marker in _RETRYABLE_MESSAGE_MARKERS)
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Read the server-requested delay from a `Retry-After` response header.
+
+    Only the delay-seconds form is supported; HTTP-date values are ignored.
+    """
+    response = getattr(error, "raw_response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    try:
+        return max(0.0, float(headers.get("retry-after", "")))
+    except ValueError:
+        return None
+
+
+def retry_on_rate_limit(
+    max_attempts: int = 3,
+    base: float = 1.0,
+    cap: float = 30.0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Retry a call on transient API errors with exponential backoff.
+
+    Waits `min(cap, base * 2**attempt)` seconds plus a random jitter of up to
+    `base` seconds between attempts, so concurrent workers hitting the same
+    rate limit don't retry in lockstep. When the API sends a `Retry-After`
+    header, the wait is stretched to honor it (still bounded by `cap`).
+    Non-transient errors (see `is_retryable_error`) are raised immediately,
+    and the last error is raised once `max_attempts` is reached.
+    """
+    assert max_attempts >= 1, "max_attempts must be at least 1"
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            for attempt in range(max_attempts - 1):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if not is_retryable_error(e):
+                        raise
+                    delay = max(base * 2**attempt, retry_after_seconds(e) or 0.0)
+                sleep(min(cap, delay) + random.uniform(0, base))
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def initialize_mistral_client(
+    api_key: str | None = None, max_connections: int = DEFAULT_MAX_CONNECTIONS
+) -> "Mistral | None":
     """Initialize and return Mistral client with given API key or from environment.
 
     Args:
         api_key: Optional API key. If None, will try to get from environment.
+        max_connections: Size of the HTTP connection pool. Match it to the
+            number of threads sharing the client so every worker can keep
+            its connection (and TLS session) alive between requests.
 
     Returns:
         Initialized Mistral client or None if initialization fails.
     """
+    assert max_connections >= 1, "max_connections must be at least 1"
+
     if not api_key:
         api_key = os.environ.get("MISTRAL_API_KEY")
 
     if not api_key:
         return None
 
-    return Mistral(api_key=api_key)
+    return _create_mistral_client(api_key, max_connections)
+
+
+# Clients are reused per API key, so repeated initialization (CLI helpers,
+# tests, Streamlit reruns) keeps the same HTTP connection pool.
+@functools.lru_cache(maxsize=4)
+def _create_mistral_client(api_key: str, max_connections: int) -> "Mistral":
+    import httpx
+    from mistralai import Mistral
+
+    http_client = httpx.Client(
+        # HTTP/2 multiplexes concurrent requests over one connection, but
+        # needs the optional `h2` package (`httpx[http2]`).
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        ),
+    )
+    return Mistral(api_key=api_key, client=http_client)
+
+
+# Every API call of the upload -> signed URL -> OCR flow counts against the
+# account's rate limit, so each one takes a limiter slot and is retried on
+# transient errors on its own: a 429 on the OCR step doesn't redo the upload.
+@retry_on_rate_limit()
+def _upload(
+    client: "Mistral",
+    content: bytes | BufferedReader,
+    file_name: str,
+    rate_limiter: RateLimiter | None,
+) -> str:
+    if not isinstance(content, bytes):
+        # A failed attempt may have consumed part of the stream.
+        content.seek(0)
+    with rate_limiter or nullcontext():
+        uploaded_pdf = client.files.upload(
+            file={
+                "file_name": file_name,
+                "content": content,
+            },
+            purpose="ocr",
+        )
+    return uploaded_pdf.id
+
+
+@retry_on_rate_limit()
+def _get_signed_url(
+    client: "Mistral", file_id: str, rate_limiter: RateLimiter | None
+) -> str:
+    with rate_limiter or nullcontext():
+        return client.files.get_signed_url(file_id=file_id).url
+
+
+@retry_on_rate_limit()
+def _run_ocr(
+    client: "Mistral",
+    document_url: str,
+    include_image_base64: bool,
+    rate_limiter: RateLimiter | None,
+) -> "OCRResponse":
+    with rate_limiter or nullcontext():
+        return client.ocr.process(
+            model=OCR_MODEL,
+            document={"type": "document_url", "document_url": document_url},
+            include_image_base64=include_image_base64,
+        )
 
 
 def process_pdf_url(
-    client: Mistral, url: str, include_image_base64: bool = False
-) -> OCRResponse:
+    client: "Mistral",
+    url: str,
+    include_image_base64: bool = False,
+    rate_limiter: RateLimiter | None = None,
+) -> "OCRResponse":
     """Process PDF from URL and return OCR results.
 
     Args:
         client: Initialized Mistral client
         url: URL of the PDF to process
         include_image_base64: Whether to include base64 encoded images
+        rate_limiter: Optional limiter shared by concurrent callers
 
     Returns:
         OCR response from Mistral API
@@ -57,24 +278,62 @@ def process_pdf_url(
     Raises:
         Exception: If processing fails
     """
-    return client.ocr.process(
-        model="mistral-ocr-latest",
-        document={"type": "document_url", "document_url": url},
-        include_image_base64=include_image_base64,
-    )
+    return _run_ocr(client, url, include_image_base64, rate_limiter)
+
+
+def process_pdf_content(
+    client: "Mistral",
+    content: bytes | BufferedReader,
+    file_name: str,
+    include_image_base64: bool = False,
+    rate_limiter: RateLimiter | None = None,
+) -> "OCRResponse":
+    """Upload PDF content and return OCR results.
+
+    Runs Mistral's upload → signed URL → OCR flow. Use it for PDFs that are
+    already in memory (e.g. browser uploads); `process_pdf_file` is the
+    on-disk counterpart. File objects are uploaded from their start.
+
+    The SDK only accepts bytes or a file opened with `open(path, "rb")`:
+    other streams, such as `io.BytesIO` or temporary files, fail its
+    validation and must be converted (e.g. with `getvalue()`) first.
+
+    Args:
+        client: Initialized Mistral client
+        content: PDF content, as bytes or a file opened in "rb" mode
+        file_name: File name reported to the Mistral API
+        include_image_base64: Whether to include base64 encoded images
+        rate_limiter: Optional limiter shared by concurrent callers
+
+    Returns:
+        OCR response from Mistral API
+
+    Raises:
+        Exception: If processing fails
+    """
+    # Upload the file
+    file_id = _upload(client, content, file_name, rate_limiter)
+
+    # Get signed URL
+    signed_url = _get_signed_url(client, file_id, rate_limiter)
+
+    # Process OCR
+    return _run_ocr(client, signed_url, include_image_base64, rate_limiter)
 
 
 def process_pdf_file(
-    client: Mistral,
+    client: "Mistral",
     file_path: Path,
     include_image_base64: bool = False,
-) -> OCRResponse:
+    rate_limiter: RateLimiter | None = None,
+) -> "OCRResponse":
     """Process PDF file and return OCR results.
 
     Args:
         client: Initialized Mistral client
         file_path: Path to the PDF file
         include_image_base64: Whether to include base64 encoded images
+        rate_limiter: Optional limiter shared by concurrent callers
 
     Returns:
         OCR response from Mistral API
@@ -86,34 +345,15 @@ def process_pdf_file(
     if not file_path.exists():
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    # Read file content
+    # Hand the SDK the open handle so the upload streams from disk instead of
+    # holding a full copy of the PDF in memory
     with open(file_path, "rb") as f:
-        file_content = f.read()
-
-    # Upload the file
-    uploaded_pdf = client.files.upload(
-        file={
-            "file_name": file_path.name,
-            "content": file_content,
-        },
-        purpose="ocr",
-    )
-
-    # Get signed URL
-    signed_url = client.files.get_signed_url(file_id=uploaded_pdf.id)
-
-    # Process OCR
-    return client.ocr.process(
-        model="mistral-ocr-latest",
-        document={
-            "type": "document_url",
-            "document_url": signed_url.url,
-        },
-        include_image_base64=include_image_base64,
-    )
+        return process_pdf_content(
+            client, f, file_path.name, include_image_base64, rate_limiter
+        )
 
 
-def extract_markdown_from_response(ocr_response: OCRResponse) -> str:
+def extract_markdown_from_response(ocr_response: "OCRResponse") -> str:
     """Extract and combine markdown content from OCR response.
 
     Args:
@@ -122,11 +362,16 @@ def extract_markdown_from_response(ocr_response: OCRResponse) -> str:
     Returns:
         Combined markdown content from all pages
     """
-    return "\n\n".join(page.markdown for page in ocr_response.pages)
+    return "\n\n".join([page.markdown for page in ocr_response.pages])
 
 
 def save_markdown_to_file(content: str, output_path: Path) -> None:
-    """Save markdown content to a file.
+    """Save markdown content to a file, atomically.
+
+    The content is written to a temporary sibling file then renamed over
+    `output_path`, so an interrupted run never leaves a truncated markdown
+    file behind. The parent directory must already exist: batch callers
+    create it once rather than once per file.
 
     Args:
         content: Markdown content to save
@@ -135,84 +380,236 @@ def save_markdown_to_file(content: str, output_path: Path) -> None:
     Raises:
         OSError: If file cannot be written
     """
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(content, encoding="utf-8")
+    # Unique per writer thread: several PDFs may map to the same output name.
+    tmp_path = output_path.with_name(
+        f"{output_path.name}.{os.getpid()}-{threading.get_ident()}.tmp"
+    )
+    try:
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def markdown_output_path(input_path: Path, output_dir: Path) -> Path:
+    """Path where `process_and_save_pdf` saves the markdown for `input_path`."""
+    return output_dir / f"{input_path.stem}.md"
+
+
+def check_existing_output(
+    output_path: Path, force: bool
+) -> tuple[bool, str, ProcessedDocument | None] | None:
+    """Return the "skipped" result if `output_path` must not be overwritten.
+
+    Lets batch callers skip a file before paying for any OCR work on it.
+    """
+    if force or not output_path.exists():
+        return None
+
+    return (
+        False,
+        f"Output file {output_path} already exists. Use --force to overwrite.",
+        None,
+    )
+
+
+def claim_output_path(
+    output_path: Path, force: bool, claimed: set[Path]
+) -> tuple[bool, str, ProcessedDocument | None] | None:
+    """Like `check_existing_output`, but also for outputs of the current run.
+
+    Inputs are written flat into the output directory, so PDFs with the same
+    name in different subdirectories map to the same markdown file. Batch
+    callers only write that file later, so checking the disk is not enough:
+    the first PDF claims the path, and later ones are skipped unless `force`.
+
+    Args:
+        output_path: Path the markdown would be saved at
+        force: Whether to overwrite existing files
+        claimed: Output paths already claimed in this run, updated in place
+
+    Returns:
+        The "skipped" result, or None if the caller may write `output_path`
+    """
+    if not force and output_path in claimed:
+        return (
+            False,
+            f"Output file {output_path} is already written by another PDF in "
+            "this run. Use --force to overwrite.",
+            None,
+        )
+    if skipped := check_existing_output(output_path, force):
+        return skipped
+    claimed.add(output_path)
+    return None
+
+
+class MarkdownWriter:
+    """Write markdown files on background threads.
+
+    Lets OCR workers move on to their next network request instead of blocking
+    on disk. Use it as a context manager; leaving the block waits for every
+    queued write, after which `errors` lists the writes that failed:
+
+        with MarkdownWriter() as writer:
+            writer.submit(content, output_path)
+        for output_path, message in writer.errors.items():
+            ...
+    """
+
+    def __init__(self, max_workers: int = 2) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="markdown-writer"
+        )
+        # Every write is kept, even when a later one targets the same path:
+        # a failure of the first must still be reported.
+        self._pending: list[tuple[Path, Future[None]]] = []
+        self._lock = threading.Lock()
+        self.errors: dict[Path, str] = {}
+
+    def submit(self, content: str, output_path: Path) -> None:
+        """Queue `content` to be saved at `output_path`."""
+        future = self._executor.submit(save_markdown_to_file, content, output_path)
+        with self._lock:
+            self._pending.append((output_path, future))
+
+    def __enter__(self) -> "MarkdownWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._executor.shutdown(wait=True)
+        errors: dict[Path, list[str]] = {}
+        for output_path, future in self._pending:
+            if (error := future.exception()) is not None:
+                errors.setdefault(output_path, []).append(str(error))
+        self.errors = {
+            output_path: "; ".join(messages) for output_path, messages in errors.items()
+        }
+
+
+def cached_result(
+    input_path: Path,
+    output_path: Path,
+    pdf_hash: str,
+    cache: Cache | None,
+    save: Callable[[str, Path], None] = save_markdown_to_file,
+) -> tuple[bool, str, ProcessedDocument | None] | None:
+    """Save the cached markdown for `input_path`, if the cache has it.
+
+    Returns:
+        The "cached" result, or None on a cache miss
+    """
+    if not cache:
+        return None
+    cached = cache.get(pdf_hash)
+    if not cached:
+        return None
+
+    save(cached.markdown_content, output_path)
+    processed_doc = ProcessedDocument(
+        filename=input_path.name,
+        content=cached.markdown_content,
+        output_path=output_path,
+        from_cache=True,
+    )
+    return (True, f"{input_path} (cached)", processed_doc)
+
+
+def make_cache_entry(
+    input_path: Path, pdf_hash: str, markdown_content: str
+) -> CacheEntry:
+    """Build the cache entry recording the OCR result of `input_path`."""
+    now = datetime.now(UTC).isoformat()
+    return CacheEntry(
+        pdf_hash=pdf_hash,
+        filename=input_path.name,
+        source_path=str(input_path),
+        size_bytes=input_path.stat().st_size,
+        markdown_content=markdown_content,
+        created_at=now,
+        last_accessed=now,
+        mistral_model=OCR_MODEL,
+    )
+
+
+def store_result(
+    input_path: Path,
+    output_path: Path,
+    pdf_hash: str,
+    markdown_content: str,
+    cache: Cache | None,
+    save: Callable[[str, Path], None] = save_markdown_to_file,
+) -> tuple[bool, str, ProcessedDocument | None]:
+    """Save freshly extracted markdown and record it in the cache.
+
+    Returns:
+        The "processed" result for `input_path`
+    """
+    save(markdown_content, output_path)
+
+    processed_doc = ProcessedDocument(
+        filename=input_path.name,
+        content=markdown_content,
+        output_path=output_path,
+        from_cache=False,
+    )
+
+    if cache:
+        cache.set(make_cache_entry(input_path, pdf_hash, markdown_content))
+
+    return (
+        True,
+        f"Successfully processed {input_path} -> {output_path}",
+        processed_doc,
+    )
 
 
 def process_and_save_pdf(
-    client: Mistral,
+    client: "Mistral",
     input_path: Path,
     output_dir: Path,
     force: bool = False,
     cache: Cache | None = None,
+    rate_limiter: RateLimiter | None = None,
+    writer: MarkdownWriter | None = None,
 ) -> tuple[bool, str, ProcessedDocument | None]:
     """Process a single PDF file and save its markdown output.
 
     Args:
         client: Initialized Mistral client
         input_path: Path to the PDF file
-        output_dir: Directory to save the markdown file
+        output_dir: Existing directory to save the markdown file
         force: Whether to overwrite existing files
+        rate_limiter: Optional limiter shared by concurrent callers
+        writer: Optional background writer. When given, the markdown file is
+            only guaranteed to exist once the writer's block has exited.
 
     Returns:
         Tuple of (success, message, processed_document)
         processed_document is None if processing failed
     """
+    save = writer.submit if writer else save_markdown_to_file
+
     try:
-        output_path = output_dir / f"{input_path.stem}.md"
-
-        if output_path.exists() and not force:
-            return (
-                False,
-                f"Output file {output_path} already exists. Use --force to overwrite.",
-                None,
-            )
-
-        pdf_hash = compute_pdf_hash(input_path)
-        if cache:
-            cached = cache.get(pdf_hash)
-            if cached:
-                save_markdown_to_file(cached.markdown_content, output_path)
-                processed_doc = ProcessedDocument(
-                    filename=input_path.name,
-                    content=cached.markdown_content,
-                    output_path=output_path,
-                    from_cache=True,
-                )
-                return (
-                    True,
-                    f"{input_path} (cached)",
-                    processed_doc,
-                )
-
-        ocr_response = process_pdf_file(client, input_path)
-        markdown_content = extract_markdown_from_response(ocr_response)
-        save_markdown_to_file(markdown_content, output_path)
+        output_path = markdown_output_path(input_path, output_dir)
 
-        processed_doc = ProcessedDocument(
-            filename=input_path.name,
-            content=markdown_content,
-            output_path=output_path,
-            from_cache=False,
-        )
+        if existing := check_existing_output(output_path, force):
+            return existing
 
-        if cache:
-            entry = CacheEntry(
-                pdf_hash=pdf_hash,
-                filename=input_path.name,
-                source_path=str(input_path),
-                size_bytes=input_path.stat().st_size,
-                markdown_content=markdown_content,
-                created_at=datetime.now(UTC).isoformat(),
-                last_accessed=datetime.now(UTC).isoformat(),
-                mistral_model="mistral-ocr-latest",
-            )
-            cache.set(entry)
+        pdf_hash = cached_pdf_hash(input_path, cache)
+        if cached := cached_result(input_path, output_path, pdf_hash, cache, save):
+            return cached
 
-        return (
-            True,
-            f"Successfully processed {input_path} -> {output_path}",
-            processed_doc,
+        ocr_response = process_pdf_file(client, input_path, rate_limiter=rate_limiter)
+        markdown_content = extract_markdown_from_response(ocr_response)
+        return store_result(
+            input_path, output_path, pdf_hash, markdown_content, cache, save
         )
 
     except Exception as e:
@@ -252,6 +649,9 @@ def copy_to_clipboard(content: str) -> tuple[bool, str]:
         Tuple of (success, message)
     """
     try:
+        # Only needed with --clipboard; it probes for clipboard backends.
+        import pyperclip  # type: ignore[import-untyped]
+
         pyperclip.copy(content)  # type: ignore[no-untyped-call]
         return True, "Successfully copied to clipboard"
     except Exception as e:
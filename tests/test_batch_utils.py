@@ -0,0 +1,262 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import httpx
+import pytest
+
+from mistral_ocr.batch_utils import (
+    OCR_ENDPOINT,
+    estimated_request_size,
+    process_pdfs_in_batch,
+    submit_ocr_batch,
+    wait_for_batch,
+)
+from mistral_ocr.cache_utils import Cache, compute_pdf_hash
+from tests.test_utils import (
+    cache_pdf,
+    create_single_test_pdf,
+    mock_mistral_client,
+    uploaded_file_response,
+)
+
+
+class FakeBatchClient:
+    """Just enough of the Mistral client for a batch job round trip."""
+
+    def __init__(
+        self,
+        results: list[dict[str, Any]],
+        errors: list[dict[str, Any]] | None = None,
+        status: str = "SUCCESS",
+    ) -> None:
+        self.requests: list[dict[str, Any]] = []
+        self.input_files: list[str] = []
+        self.files = SimpleNamespace(upload=self._upload, download=self._download)
+        self.batch = SimpleNamespace(
+            jobs=SimpleNamespace(create=self._create, get=self._get)
+        )
+        self._status = status
+        self._downloads = {
+            "output-file": results,
+            "error-file": errors or [],
+        }
+
+    def _upload(self, file: dict[str, Any], purpose: str) -> SimpleNamespace:
+        assert purpose == "batch"
+        self.requests += [
+            json.loads(line) for line in file["content"].read().splitlines()
+        ]
+        self.input_files.append(f"input-file-{len(self.input_files)}")
+        return SimpleNamespace(id=self.input_files[-1])
+
+    def _create(self, **kwargs: Any) -> SimpleNamespace:
+        assert kwargs["input_files"] == self.input_files
+        return SimpleNamespace(id="job-1")
+
+    def _get(self, job_id: str) -> SimpleNamespace:
+        assert job_id == "job-1"
+        return SimpleNamespace(
+            status=self._status,
+            output_file="output-file" if self._downloads["output-file"] else None,
+            error_file="error-file" if self._downloads["error-file"] else None,
+        )
+
+    def _download(self, file_id: str) -> httpx.Response:
+        records = self._downloads[file_id]
+        return httpx.Response(200, text="\n".join(map(json.dumps, records)))
+
+
+def _ocr_result(custom_id: str, markdown: str) -> dict[str, Any]:
+    return {
+        "custom_id": custom_id,
+        "response": {"status_code": 200, "body": {"pages": [{"markdown": markdown}]}},
+    }
+
+
+def test_process_pdfs_in_batch_sends_only_uncached_files(tmp_path: Path) -> None:
+    cache = Cache(enabled=True, cache_dir=tmp_path / "cache")
+    pdfs = [tmp_path / f"doc{i}.pdf" for i in range(3)]
+    for i, pdf in enumerate(pdfs):
+        create_single_test_pdf(pdf, f"document {i}")
+    cache_pdf(cache, pdfs[1], "cached content")
+    client = FakeBatchClient(
+        [
+            _ocr_result("0", "batched content"),
+            {"custom_id": "1", "response": {"status_code": 500, "body": {}}},
+        ]
+    )
+
+    results = process_pdfs_in_batch(
+        client,  # type: ignore[arg-type]
+        pdfs,
+        tmp_path / "out",
+        force=False,
+        cache=cache,
+    )
+
+    assert [request["custom_id"] for request in client.requests] == ["0", "1"]
+    [(ok0, _, doc0), (ok1, _, doc1), (ok2, message2, _)] = results
+    assert ok0 and doc0 and doc0.content == "batched content"
+    assert ok1 and doc1 and doc1.from_cache
+    assert not ok2 and "doc2.pdf" in message2
+    assert (tmp_path / "out" / "doc0.md").read_text() == "batched content"
+    assert not (tmp_path / "out" / "doc2.md").exists()
+    cached = cache.get(compute_pdf_hash(pdfs[0]))
+    assert cached and cached.markdown_content == "batched content"
+
+
+@pytest.mark.parametrize("status", ["FAILED", "TIMEOUT_EXCEEDED"])
+def test_process_pdfs_in_batch_reports_unfinished_jobs(
+    tmp_path: Path, status: str
+) -> None:
+    pdfs = [tmp_path / f"doc{i}.pdf" for i in range(2)]
+    for i, pdf in enumerate(pdfs):
+        create_single_test_pdf(pdf, f"document {i}")
+    client = FakeBatchClient([], status=status)
+
+    results = process_pdfs_in_batch(
+        client,  # type: ignore[arg-type]
+        pdfs,
+        tmp_path / "out",
+        force=False,
+        cache=None,
+    )
+
+    assert [ok for ok, _, _ in results] == [False, False]
+    assert all(f"ended with status {status}" in message for _, message, _ in results)
+    assert not (tmp_path / "out" / "doc0.md").exists()
+
+
+def test_process_pdfs_in_batch_reads_error_file_records(tmp_path: Path) -> None:
+    pdfs = [tmp_path / f"doc{i}.pdf" for i in range(2)]
+    for i, pdf in enumerate(pdfs):
+        create_single_test_pdf(pdf, f"document {i}")
+    client = FakeBatchClient(
+        [],
+        errors=[
+            {"custom_id": "0", "error": "document is encrypted"},
+            {"custom_id": "1", "error": "too many pages"},
+        ],
+    )
+
+    results = process_pdfs_in_batch(
+        client,  # type: ignore[arg-type]
+        pdfs,
+        tmp_path / "out",
+        force=False,
+        cache=None,
+    )
+
+    [(ok0, message0, _), (ok1, message1, _)] = results
+    assert not ok0 and "document is encrypted" in message0
+    assert not ok1 and "too many pages" in message1
+
+
+def test_process_pdfs_in_batch_splits_requests_over_input_files(
+    tmp_path: Path,
+) -> None:
+    pdfs = [tmp_path / f"doc{i}.pdf" for i in range(3)]
+    for i, pdf in enumerate(pdfs):
+        create_single_test_pdf(pdf, f"document {i}")
+    client = FakeBatchClient([_ocr_result(str(i), f"content {i}") for i in range(3)])
+
+    results = process_pdfs_in_batch(
+        client,  # type: ignore[arg-type]
+        pdfs,
+        tmp_path / "out",
+        force=False,
+        cache=None,
+        max_file_bytes=max(estimated_request_size(pdf) for pdf in pdfs),
+    )
+
+    assert len(client.input_files) == 3
+    assert [request["custom_id"] for request in client.requests] == ["0", "1", "2"]
+    assert [doc.content for _, _, doc in results if doc] == [
+        f"content {i}" for i in range(3)
+    ]
+
+
+def test_process_pdfs_in_batch_does_not_overwrite_same_stem_outputs(
+    tmp_path: Path,
+) -> None:
+    pdfs = [tmp_path / "a" / "report.pdf", tmp_path / "b" / "report.pdf"]
+    for i, pdf in enumerate(pdfs):
+        pdf.parent.mkdir()
+        create_single_test_pdf(pdf, f"report {i}")
+    client = FakeBatchClient([_ocr_result("0", "content 0")])
+
+    results = process_pdfs_in_batch(
+        client,  # type: ignore[arg-type]
+        pdfs,
+        tmp_path / "out",
+        force=False,
+        cache=None,
+    )
+
+    assert len(client.requests) == 1
+    [(ok_a, _, _), (ok_b, message_b, _)] = results
+    assert ok_a
+    assert not ok_b and "already written by another PDF" in message_b
+    assert (tmp_path / "out" / "report.md").read_text() == "content 0"
+
+
+def test_wait_for_batch_gives_up_after_max_wait() -> None:
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    client = SimpleNamespace(
+        batch=SimpleNamespace(
+            jobs=SimpleNamespace(get=lambda job_id: SimpleNamespace(status="RUNNING"))
+        )
+    )
+
+    with pytest.raises(TimeoutError, match="job-1 still RUNNING"):
+        wait_for_batch(
+            client,  # type: ignore[arg-type]
+            "job-1",
+            max_wait=10.0,
+            sleep=sleep,
+            clock=lambda: now[0],
+        )
+
+    assert sleeps == [2.0, 4.0, 4.0]
+
+
+def test_submit_ocr_batch_uploads_through_the_sdk(tmp_path: Path) -> None:
+    pdf = tmp_path / "doc.pdf"
+    create_single_test_pdf(pdf, "document")
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/v1/files":
+            return uploaded_file_response(request, "batch")
+        assert request.url.path == "/v1/batch/jobs"
+        return httpx.Response(
+            200,
+            json={
+                "id": "job-1",
+                "input_files": ["file-1"],
+                "endpoint": OCR_ENDPOINT,
+                "model": "mistral-ocr-latest",
+                "errors": [],
+                "status": "QUEUED",
+                "created_at": 0,
+                "total_requests": 1,
+                "completed_requests": 0,
+                "succeeded_requests": 0,
+                "failed_requests": 0,
+            },
+        )
+
+    assert submit_ocr_batch(mock_mistral_client(handler), [pdf]) == "job-1"
+
+    upload, create = requests
+    assert b'"custom_id": "0"' in upload.content
+    assert json.loads(create.content)["input_files"] == ["file-1"]
@@ -1,7 +1,20 @@
+import hashlib
+import os
+import sqlite3
+import sys
+import time
 from pathlib import Path
 from datetime import UTC, datetime
 
-from mistral_ocr.cache_utils import Cache, CacheEntry, compute_pdf_hash
+import pytest
+
+from mistral_ocr.cache_utils import (
+    MMAP_HASH_MIN_SIZE,
+    Cache,
+    CacheEntry,
+    cached_pdf_hash,
+    compute_pdf_hash,
+)
 from tests.test_utils import create_single_test_pdf
 
 
@@ -47,3 +60,98 @@ def test_cache_clear(tmp_path: Path) -> None:
     cache.clear()
     stats = cache.stats()
     assert stats.get("total_entries", 0) == 0
+
+
+def test_compute_pdf_hash_is_sha256_of_content(tmp_path: Path) -> None:
+    pdf = tmp_path / "test.pdf"
+    create_single_test_pdf(pdf, "hash test")
+    assert compute_pdf_hash(pdf) == hashlib.sha256(pdf.read_bytes()).hexdigest()
+
+
+def test_compute_pdf_hash_of_large_file(tmp_path: Path) -> None:
+    pdf = tmp_path / "large.pdf"
+    content = b"%PDF-1.4\n" + bytes(range(256)) * (MMAP_HASH_MIN_SIZE // 128)
+    pdf.write_bytes(content)
+    assert compute_pdf_hash(pdf) == hashlib.sha256(content).hexdigest()
+
+
+def test_cached_pdf_hash_reuses_fingerprint_until_file_changes(tmp_path: Path) -> None:
+    cache = Cache(enabled=True, cache_dir=tmp_path / "cache")
+    pdf = tmp_path / "test.pdf"
+    create_single_test_pdf(pdf, "fingerprint")
+    st = pdf.stat()
+
+    assert cache.fingerprint_lookup(st) is None
+    assert cached_pdf_hash(pdf, cache) == compute_pdf_hash(pdf)
+    cache.fingerprint_store(st, "recorded")
+    assert cached_pdf_hash(pdf, cache) == "recorded"
+
+    pdf.write_bytes(pdf.read_bytes() + b"\n")
+    assert cached_pdf_hash(pdf, cache) == compute_pdf_hash(pdf)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="st_ctime is the creation time")
+def test_cached_pdf_hash_detects_rewrite_with_restored_mtime(tmp_path: Path) -> None:
+    cache = Cache(enabled=True, cache_dir=tmp_path / "cache")
+    pdf = tmp_path / "test.pdf"
+    pdf.write_bytes(b"%PDF-1.4 first version")
+    st = pdf.stat()
+    cache.fingerprint_store(st, "first version hash")
+    # Timestamps come from a coarse clock: make sure the ctime can move.
+    time.sleep(0.05)
+
+    # Same size, mtime put back as `cp -p` or `rsync -t` would.
+    pdf.write_bytes(b"%PDF-1.4 other version")
+    os.utime(pdf, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    assert cached_pdf_hash(pdf, cache) == compute_pdf_hash(pdf)
+
+
+def test_cache_get_defers_last_accessed_update(tmp_path: Path) -> None:
+    cache = Cache(enabled=True, cache_dir=tmp_path)
+    cache.set(
+        CacheEntry(
+            pdf_hash="abc",
+            filename="a.pdf",
+            source_path="/tmp/a.pdf",
+            size_bytes=10,
+            markdown_content="content",
+            created_at="2024-01-01T00:00:00+00:00",
+            last_accessed="2024-01-01T00:00:00+00:00",
+            mistral_model="test",
+        )
+    )
+
+    cache.get("abc")
+    loaded = cache.get("abc")
+    assert loaded is not None
+    assert loaded.last_accessed == "2024-01-01T00:00:00+00:00"
+
+    cache.close()
+    loaded = Cache(enabled=True, cache_dir=tmp_path).get("abc")
+    assert loaded is not None
+    assert loaded.last_accessed > "2024-01-01T00:00:00+00:00"
+
+
+def test_cache_compresses_markdown_and_reads_legacy_rows(tmp_path: Path) -> None:
+    cache = Cache(enabled=True, cache_dir=tmp_path)
+    now = datetime.now(UTC).isoformat()
+    content = "| cell | cell |\n" * 1000
+    cache.set(CacheEntry("new", "a.pdf", "/a.pdf", 10, content, now, now, "test"))
+    cache.close()
+    assert cache.db_path is not None
+    with sqlite3.connect(cache.db_path) as conn:
+        conn.execute(
+            "INSERT INTO cache_entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ("old", "b.pdf", "/b.pdf", 10, "plain text", now, now, "test"),
+        )
+        [(stored_size,)] = conn.execute(
+            "SELECT LENGTH(markdown_content) FROM cache_entries WHERE pdf_hash='new'"
+        )
+    conn.close()
+
+    assert stored_size < len(content) // 10
+    assert cache.stats()["total_size"] == stored_size + len(b"plain text")
+    new, old = cache.get("new"), cache.get("old")
+    assert new is not None and new.markdown_content == content
+    assert old is not None and old.markdown_content == "plain text"
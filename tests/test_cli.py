@@ -0,0 +1,204 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+import rich.progress
+from mistralai import Mistral
+from typer.testing import CliRunner
+
+import mistral_ocr
+from mistral_ocr import (
+    _prefetch,
+    app,
+    create_conversion_plan,
+    find_pdf_files,
+    process_pdf_files,
+)
+from mistral_ocr.cache_utils import Cache
+from tests.test_utils import cache_pdf, create_single_test_pdf, create_test_pdfs
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_process_pdf_files_preserves_input_order(
+    tmp_path: Path, lazy: bool, concurrency: int
+) -> None:
+    cache = Cache(enabled=True, cache_dir=tmp_path / "cache")
+    pdfs = [tmp_path / f"doc{i}.pdf" for i in range(5)]
+    for i, pdf in enumerate(pdfs):
+        create_single_test_pdf(pdf, f"document {i}")
+        cache_pdf(cache, pdf, f"content {i}")
+
+    results = process_pdf_files(
+        Mistral(api_key="unused"),
+        iter(pdfs) if lazy else pdfs,
+        tmp_path / "out",
+        force=False,
+        cache=cache,
+        show_progress=False,
+        concurrency=concurrency,
+    )
+
+    assert [doc.content for _, _, doc in results if doc] == [
+        f"content {i}" for i in range(5)
+    ]
+    assert all(doc.from_cache for _, _, doc in results if doc)
+    assert (tmp_path / "out" / "doc4.md").read_text() == "content 4"
+
+
+def test_process_pdf_files_skips_existing_outputs(tmp_path: Path) -> None:
+    pdf = tmp_path / "done.pdf"
+    create_single_test_pdf(pdf, "already converted")
+    (tmp_path / "done.md").write_text("previous run")
+
+    results = process_pdf_files(
+        Mistral(api_key="unused"),
+        [pdf],
+        tmp_path,
+        force=False,
+        cache=None,
+        show_progress=False,
+    )
+
+    [(success, message, doc)] = results
+    assert not success
+    assert "already exists" in message
+    assert doc is None
+    assert (tmp_path / "done.md").read_text() == "previous run"
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_process_pdf_files_does_not_overwrite_same_stem_outputs(
+    tmp_path: Path, concurrency: int
+) -> None:
+    cache = Cache(enabled=True, cache_dir=tmp_path / "cache")
+    pdfs = [tmp_path / "a" / "report.pdf", tmp_path / "b" / "report.pdf"]
+    for i, pdf in enumerate(pdfs):
+        pdf.parent.mkdir()
+        create_single_test_pdf(pdf, f"report {i}")
+        cache_pdf(cache, pdf, f"content {i}")
+
+    results = process_pdf_files(
+        Mistral(api_key="unused"),
+        pdfs,
+        tmp_path / "out",
+        force=False,
+        cache=cache,
+        show_progress=False,
+        concurrency=concurrency,
+    )
+
+    [(ok_a, _, _), (ok_b, message_b, _)] = results
+    assert ok_a
+    assert not ok_b and "already written by another PDF" in message_b
+    assert (tmp_path / "out" / "report.md").read_text() == "content 0"
+
+
+def test_find_pdf_files_walks_nested_directories(tmp_path: Path) -> None:
+    expected = create_test_pdfs(tmp_path)
+    (tmp_path / "notes.txt").write_text("not a pdf")
+    (tmp_path / "reports" / "UPPER.PDF").write_bytes(b"%PDF-1.4")
+
+    found = {p.relative_to(tmp_path).as_posix() for p in find_pdf_files(tmp_path)}
+
+    assert found == set(expected) | {"reports/UPPER.PDF"}
+
+
+def test_create_conversion_plan_skips_existing_outputs(tmp_path: Path) -> None:
+    create_test_pdfs(tmp_path)
+    (tmp_path / "reports" / "quarterly_report.md").write_text("done")
+
+    plan = create_conversion_plan(tmp_path, None, force=False, clipboard=False)
+
+    skipped = [a.input_path.name for a in plan.files if a.is_skipping]
+    assert skipped == ["quarterly_report.pdf"]
+    assert len(plan.files) == 9
+
+
+def test_create_conversion_plan_single_file(tmp_path: Path) -> None:
+    pdf = tmp_path / "single.pdf"
+    create_single_test_pdf(pdf, "one file")
+    (tmp_path / "single.md").write_text("done")
+
+    plan = create_conversion_plan(pdf, None, force=True, clipboard=False)
+
+    [action] = plan.files
+    assert action.input_path == pdf
+    assert action.output_path == tmp_path / "single.md"
+    assert action.will_overwrite
+
+
+def test_prefetch_preserves_order_and_reraises() -> None:
+    def items() -> Iterator[int]:
+        yield from range(10)
+        raise OSError("scan failed")
+
+    received: list[int] = []
+    with pytest.raises(OSError, match="scan failed"):
+        for item in _prefetch(items(), maxsize=2):
+            received.append(item)
+
+    assert received == list(range(10))
+
+
+def test_find_pdf_files_scans_many_subdirectories(tmp_path: Path) -> None:
+    expected = set()
+    for i in range(6):
+        nested = tmp_path / f"dir{i}" / "nested"
+        nested.mkdir(parents=True)
+        for pdf in (tmp_path / f"dir{i}" / "a.pdf", nested / "b.pdf"):
+            pdf.write_bytes(b"%PDF-1.4")
+            expected.add(pdf)
+
+    found = list(find_pdf_files(tmp_path))
+
+    assert len(found) == len(expected)
+    assert set(found) == expected
+
+
+def test_dry_run_does_not_create_output_directory(tmp_path: Path) -> None:
+    create_single_test_pdf(tmp_path / "doc.pdf", "dry run")
+    output_dir = tmp_path / "out"
+
+    result = CliRunner().invoke(
+        app, [str(tmp_path), "--output-dir", str(output_dir), "--dry-run"]
+    )
+
+    assert result.exit_code == 0
+    assert not output_dir.exists()
+
+
+def test_single_file_run_uses_one_worker_and_no_progress_bar(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pdf = tmp_path / "doc.pdf"
+    create_single_test_pdf(pdf, "single")
+    (tmp_path / "out").mkdir()
+    (tmp_path / "out" / "doc.md").write_text("done")
+    workers: list[int | None] = []
+    progress_disabled: list[bool] = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def __init__(self, max_workers: int | None = None, **kwargs: Any) -> None:
+            workers.append(max_workers)
+            super().__init__(max_workers, **kwargs)
+
+    class RecordingProgress(rich.progress.Progress):
+        def __init__(self, *args: Any, disable: bool = False, **kwargs: Any) -> None:
+            progress_disabled.append(disable)
+            super().__init__(*args, disable=disable, **kwargs)
+
+    monkeypatch.setattr(mistral_ocr, "ThreadPoolExecutor", RecordingExecutor)
+    monkeypatch.setattr(rich.progress, "Progress", RecordingProgress)
+
+    result = CliRunner().invoke(
+        app,
+        [str(pdf), "--output-dir", str(tmp_path / "out"), "--api-key", "unused"]
+        + ["--no-cache"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert workers == [1]
+    assert progress_disabled == [True]
@@ -0,0 +1,210 @@
+from pathlib import Path
+
+import httpx
+import pytest
+
+from mistral_ocr.ocr_utils import (
+    MarkdownWriter,
+    RateLimiter,
+    initialize_mistral_client,
+    process_pdf_content,
+    retry_on_rate_limit,
+    save_markdown_to_file,
+)
+from tests.test_utils import (
+    create_single_test_pdf,
+    mock_mistral_client,
+    uploaded_file_response,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_rate_limiter_spaces_request_starts() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(
+        requests_per_second=4, max_in_flight=2, clock=clock, sleep=clock.sleep
+    )
+
+    for _ in range(3):
+        with limiter:
+            pass
+
+    assert clock.sleeps == [0.25, 0.25]
+
+
+def test_rate_limiter_does_not_sleep_after_idle_period() -> None:
+    clock = FakeClock()
+    limiter = RateLimiter(
+        requests_per_second=4, max_in_flight=2, clock=clock, sleep=clock.sleep
+    )
+
+    with limiter:
+        pass
+    clock.now += 10
+    with limiter:
+        pass
+
+    assert clock.sleeps == []
+
+
+class FakeAPIError(Exception):
+    def __init__(
+        self, status_code: int, raw_response: httpx.Response | None = None
+    ) -> None:
+        super().__init__(f"API error: Status {status_code}")
+        self.status_code = status_code
+        self.raw_response = raw_response
+
+
+def test_retry_on_rate_limit_retries_transient_errors() -> None:
+    sleeps: list[float] = []
+    calls: list[int] = []
+
+    @retry_on_rate_limit(max_attempts=3, base=1.0, cap=30.0, sleep=sleeps.append)
+    def flaky() -> str:
+        calls.append(1)
+        if len(calls) < 3:
+            raise FakeAPIError(429)
+        return "ok"
+
+    assert flaky() == "ok"
+    assert len(calls) == 3
+    assert 1.0 <= sleeps[0] <= 2.0
+    assert 2.0 <= sleeps[1] <= 3.0
+
+
+def test_retry_on_rate_limit_raises_permanent_errors_immediately() -> None:
+    sleeps: list[float] = []
+    calls: list[int] = []
+
+    @retry_on_rate_limit(max_attempts=3, sleep=sleeps.append)
+    def broken() -> None:
+        calls.append(1)
+        raise FakeAPIError(401)
+
+    with pytest.raises(FakeAPIError):
+        broken()
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_retry_on_rate_limit_gives_up_after_max_attempts() -> None:
+    calls: list[int] = []
+
+    @retry_on_rate_limit(max_attempts=2, sleep=lambda _: None)
+    def overloaded() -> None:
+        calls.append(1)
+        raise RuntimeError("Service unavailable: 503")
+
+    with pytest.raises(RuntimeError):
+        overloaded()
+    assert len(calls) == 2
+
+
+def test_initialize_mistral_client_reuses_client_per_api_key() -> None:
+    first = initialize_mistral_client("key-a")
+    assert first is initialize_mistral_client("key-a")
+    assert first is not initialize_mistral_client("key-b")
+
+
+def test_markdown_writer_reports_failed_writes(tmp_path: Path) -> None:
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+
+    with MarkdownWriter() as writer:
+        writer.submit("ok", tmp_path / "ok.md")
+        writer.submit("ko", blocker / "ko.md")
+
+    assert (tmp_path / "ok.md").read_text() == "ok"
+    assert list(writer.errors) == [blocker / "ko.md"]
+
+
+def test_retry_on_rate_limit_honors_retry_after_header() -> None:
+    sleeps: list[float] = []
+    error = FakeAPIError(429, httpx.Response(429, headers={"Retry-After": "7"}))
+    calls: list[int] = []
+
+    @retry_on_rate_limit(max_attempts=2, base=1.0, cap=30.0, sleep=sleeps.append)
+    def limited() -> str:
+        calls.append(1)
+        if len(calls) == 1:
+            raise error
+        return "ok"
+
+    assert limited() == "ok"
+    assert 7.0 <= sleeps[0] <= 8.0
+
+
+def test_save_markdown_to_file_replaces_without_leftovers(tmp_path: Path) -> None:
+    output_path = tmp_path / "doc.md"
+    output_path.write_text("old")
+
+    save_markdown_to_file("new", output_path)
+
+    assert output_path.read_text() == "new"
+    assert [p.name for p in tmp_path.iterdir()] == ["doc.md"]
+
+
+def test_markdown_writer_keeps_errors_of_overwritten_paths(tmp_path: Path) -> None:
+    output_path = tmp_path / "same.md"
+
+    with MarkdownWriter() as writer:
+        writer.submit("\ud800 cannot be encoded", output_path)
+        writer.submit("ok", output_path)
+
+    assert output_path.read_text() == "ok"
+    assert "encode" in writer.errors[output_path]
+
+
+@pytest.mark.parametrize("as_file", [False, True])
+def test_process_pdf_content_uploads_through_the_sdk(
+    tmp_path: Path, as_file: bool
+) -> None:
+    pdf = tmp_path / "doc.pdf"
+    create_single_test_pdf(pdf, "document")
+    uploads: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/v1/files":
+            uploads.append(request.content)
+            return uploaded_file_response(request, "ocr")
+        if request.url.path == "/v1/files/file-1/url":
+            return httpx.Response(200, json={"url": "https://files.test/doc.pdf"})
+        assert request.url.path == "/v1/ocr"
+        page = {
+            "index": 0,
+            "markdown": "# Document",
+            "images": [],
+            "dimensions": {"dpi": 72, "height": 792, "width": 612},
+        }
+        return httpx.Response(
+            200,
+            json={
+                "pages": [page],
+                "model": "mistral-ocr-latest",
+                "usage_info": {"pages_processed": 1},
+            },
+        )
+
+    client = mock_mistral_client(handler)
+    if as_file:
+        with open(pdf, "rb") as f:
+            response = process_pdf_content(client, f, pdf.name)
+    else:
+        response = process_pdf_content(client, pdf.read_bytes(), pdf.name)
+
+    assert response.pages[0].markdown == "# Document"
+    [upload] = uploads
+    assert pdf.read_bytes() in upload
@@ -1,7 +1,14 @@
 """Utilities for generating test PDFs with complex directory structures."""
 
+from collections.abc import Callable
+from datetime import UTC, datetime
 from pathlib import Path
+
+import httpx
 from fpdf import FPDF
+from mistralai import Mistral
+
+from mistral_ocr.cache_utils import Cache, CacheEntry, compute_pdf_hash
 
 
 def create_test_pdfs(base_dir: Path) -> dict[str, str]:
@@ -49,3 +56,46 @@ def create_single_test_pdf(file_path: Path, content: str) -> None:
     pdf.set_font("helvetica", "B", 16)
     pdf.cell(0, 10, content, new_x="LMARGIN", new_y="NEXT")
     pdf.output(str(file_path))
+
+
+def cache_pdf(cache: Cache, pdf: Path, content: str) -> None:
+    """Record `content` as the cached OCR result of `pdf`."""
+    now = datetime.now(UTC).isoformat()
+    cache.set(
+        CacheEntry(
+            pdf_hash=compute_pdf_hash(pdf),
+            filename=pdf.name,
+            source_path=str(pdf),
+            size_bytes=pdf.stat().st_size,
+            markdown_content=content,
+            created_at=now,
+            last_accessed=now,
+            mistral_model="test",
+        )
+    )
+
+
+def mock_mistral_client(handler: Callable[[httpx.Request], httpx.Response]) -> Mistral:
+    """A real Mistral client whose HTTP requests are answered by `handler`.
+
+    Unlike a stub, requests still go through the SDK's own validation.
+    """
+    transport = httpx.MockTransport(handler)
+    return Mistral(api_key="test", client=httpx.Client(transport=transport))
+
+
+def uploaded_file_response(request: httpx.Request, purpose: str) -> httpx.Response:
+    """Answer a `files.upload` request like the Mistral API."""
+    return httpx.Response(
+        200,
+        json={
+            "id": "file-1",
+            "object": "file",
+            "bytes": len(request.content),
+            "created_at": 0,
+            "filename": "upload",
+            "purpose": purpose,
+            "sample_type": "batch_request" if purpose == "batch" else "ocr_input",
+            "source": "upload",
+        },
+    )